@@ -1,4 +1,6 @@
 #!/usr/bin/env python
+import functools
+import importlib
 import os
 import sys
 import pathlib
@@ -14,20 +16,6 @@ def join_drivers_path(path):
     return os.path.join(_ROOT, 'hailo_platform', 'drivers', path)
 
 
-from hailo_platform.tools.udp_rate_limiter import UDPRateLimiter
-from hailo_platform.pyhailort.hw_object import PcieDevice, EthernetDevice
-from hailo_platform.pyhailort.pyhailort import (HEF, ConfigureParams,
-                                                FormatType, FormatOrder,
-                                                MipiDataTypeRx, MipiPixelsPerClock,
-                                                MipiClockSelection, MipiIspImageInOrder,
-                                                MipiIspImageOutDataType, IspLightFrequency, HailoPowerMode,
-                                                Endianness, HailoStreamInterface,
-                                                InputVStreamParams, OutputVStreamParams,
-                                                InputVStreams, OutputVStreams,
-                                                InferVStreams, HailoStreamDirection, HailoFormatFlags, HailoCpuId, Device, VDevice,
-                                                DvmTypes, PowerMeasurementTypes, SamplingPeriod, AveragingFactor, MeasurementBufferIndex,
-                                                HailoRTException, HailoSchedulingAlgorithm, HailoRTStreamAbortedByUser)
-
 def _verify_pyhailort_lib_exists():
     python_version = "".join(str(i) for i in sys.version_info[:2])
     lib_extension = {
@@ -41,17 +29,18 @@ def _verify_pyhailort_lib_exists():
 
 _verify_pyhailort_lib_exists()
 
+@functools.lru_cache(maxsize=None)
 def get_version(package_name):
     # See: https://packaging.python.org/guides/single-sourcing-package-version/ (Option 5)
     # We assume that the installed package is actually the same one we import. This assumption may
     # break in some edge cases e.g. if the user modifies sys.path manually.
-    
+
     # hailo_platform package has been renamed to hailort, but the import is still hailo_platform
     if package_name == "hailo_platform":
         package_name = "hailort"
     try:
-        import pkg_resources
-        return pkg_resources.get_distribution(package_name).version
+        from importlib.metadata import version
+        return version(package_name)
     except:
         return 'unknown'
 
@@ -63,3 +52,22 @@ __all__ = ['EthernetDevice', 'DvmTypes', 'PowerMeasurementTypes',
            'Endianness', 'HailoStreamInterface', 'InputVStreamParams', 'OutputVStreamParams',
            'InputVStreams', 'OutputVStreams', 'InferVStreams', 'HailoStreamDirection', 'HailoFormatFlags', 'HailoCpuId',
            'Device', 'VDevice', 'HailoRTException', 'HailoSchedulingAlgorithm', 'HailoRTStreamAbortedByUser']
+
+# Importing the modules below loads the _pyhailort C extension, which dominates `hailo` CLI cold
+# start. The public names are therefore resolved lazily (PEP 562) on first attribute access, so
+# `import hailo_platform` itself stays cheap for flows that never touch a device
+# (e.g. `hailo --help`, `hailo --version`).
+_PYHAILORT_MODULE = 'hailo_platform.pyhailort.pyhailort'
+_LAZY_MODULES = {
+    'UDPRateLimiter': 'hailo_platform.tools.udp_rate_limiter',
+    'PcieDevice': 'hailo_platform.pyhailort.hw_object',
+    'EthernetDevice': 'hailo_platform.pyhailort.hw_object',
+}
+
+def __getattr__(name):
+    if name in __all__:
+        module = importlib.import_module(_LAZY_MODULES.get(name, _PYHAILORT_MODULE))
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
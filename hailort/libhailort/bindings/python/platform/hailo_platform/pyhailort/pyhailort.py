@@ -1368,6 +1368,9 @@ class PcieDeviceInfo(_pyhailort.PcieDeviceInfo):
     def __eq__(self, other):
         return (self.domain, self.bus, self.device, self.func) == (other.domain, other.bus, other.device, other.func)
 
+    def __hash__(self):
+        return hash((self.domain, self.bus, self.device, self.func))
+
     def __str__(self):
         with ExceptionWrapper():
             return super().__str__()
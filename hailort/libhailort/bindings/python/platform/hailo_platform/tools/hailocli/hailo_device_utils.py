@@ -1,13 +1,28 @@
 #!/usr/bin/env python
+import time
 from enum import Enum
 
 from hailo_platform.tools.hailocli.base_utils import CmdUtilsBaseUtil
-from hailo_platform.pyhailort.hw_object import EthernetDevice, PcieDevice
 from hailo_platform.common.logger.logger import default_logger
-from hailo_platform.pyhailort.pyhailort import PcieDeviceInfo, InternalPcieDevice
+
+# Note: hailo_platform.pyhailort imports (which load the C extension) are done lazily inside the
+# methods that need a device, so that commands that never touch one (e.g. --help, --version)
+# don't pay the full library load on CLI startup.
 
 logger = default_logger()
 
+# The set of connected PCIe devices is effectively static for the lifetime of a CLI invocation,
+# while a full scan costs a sysfs walk. Cache the scan result for a short time so validate_args
+# and get_target (which run back to back) pay for a single scan.
+_scan_cache = {"t": 0.0, "v": None}
+
+def _scan_devices_cached(ttl=5.0):
+    from hailo_platform.pyhailort.pyhailort import InternalPcieDevice
+    if (_scan_cache["v"] is None) or (time.monotonic() - _scan_cache["t"] >= ttl):
+        _scan_cache["v"] = frozenset(InternalPcieDevice.scan_devices())
+        _scan_cache["t"] = time.monotonic()
+    return _scan_cache["v"]
+
 class HailoCLITargets(Enum):
     udp = 'udp'
     pcie = 'pcie'
@@ -24,6 +39,7 @@ class HailoDeviceCmdUtil(CmdUtilsBaseUtil):
             self.add_target_args(args_parser)
 
     def get_target(self, args):
+        from hailo_platform.pyhailort.hw_object import EthernetDevice, PcieDevice
         self.validate_args(args)
         target_type = self.get_target_type(args)
         if target_type == HailoCLITargets.udp.value:
@@ -50,12 +66,13 @@ class HailoDeviceCmdUtil(CmdUtilsBaseUtil):
 
     def validate_args(self, args):
         if args.board_location:
-            all_devices = InternalPcieDevice.scan_devices()
+            all_devices = _scan_devices_cached()
             if args.board_location not in all_devices:
                 self._parser.error('Device {} does not appear on your host, please run `hailo scan -d pcie` to see all available devices'
                     .format(args.board_location))
 
     def add_target_args(self, args_parser):
+        from hailo_platform.pyhailort.pyhailort import PcieDeviceInfo
         args_parser.add_argument('--ip', type=str, default=None, help='IP address of the target (udp)')
         args_parser.add_argument('-s', '--board-location', help=PcieDeviceInfo.BOARD_LOCATION_HELP_STRING,
                                  type=PcieDeviceInfo.argument_type)
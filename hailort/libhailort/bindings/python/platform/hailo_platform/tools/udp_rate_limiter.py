@@ -5,6 +5,13 @@ traffic than it can handle, which would cause packet loss.
 from __future__ import division
 from builtins import object
 
+import errno
+import functools
+import os
+import socket
+import struct
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
 from hailo_platform.pyhailort.pyhailort import HEF, NetworkRateLimiter, INPUT_DATAFLOW_BASE_PORT
 
@@ -12,6 +19,20 @@ DEFAULT_MAX_KBPS = 850e3
 
 BYTES_IN_Kbits = 125.0
 
+# "1:" in tc notation; the root HTB qdisc handle used by all backends
+TC_ROOT_HANDLE = 0x10000
+ETH_P_IP = 0x0800
+
+
+@functools.lru_cache(maxsize=8)
+def _load_hef(hef_path, mtime_ns, size):
+    # mtime_ns and size are part of the key, so a modified HEF at the same path is reparsed
+    return HEF(hef_path)
+
+@functools.lru_cache(maxsize=32)
+def _get_input_stream_infos(hef_path, mtime_ns, size, network_group_name):
+    return _load_hef(hef_path, mtime_ns, size).get_input_stream_infos(network_group_name)
+
 
 class RateLimiterException(Exception):
     """A problem has occurred during the rate setting."""
@@ -27,6 +48,188 @@ class BadTCCallError(Exception):
     pass
 
 
+def _open_netlink_socket():
+    """Returns an open :class:`pyroute2.IPRoute` socket, or ``None`` if the netlink backend
+    cannot be used. tc operations over netlink need CAP_NET_ADMIN and, unlike the shell
+    backends, cannot escalate through sudo, so non-root processes stay on the shell path.
+    """
+    if (not hasattr(os, 'geteuid')) or (os.geteuid() != 0):
+        return None
+    try:
+        from pyroute2 import IPRoute
+    except ImportError:
+        return None
+    return IPRoute()
+
+def _ip_to_board_id(ip):
+    # Last digit of the third octet plus the whole fourth octet, to get an id that is
+    # (hopefully) unique per board. Same scheme as the tc shell backend.
+    octets = ip.split('.')
+    return int(octets[2][-1] + octets[3])
+
+def _port_to_port_id(port):
+    # We use % to make the id unique (hopefully)
+    return port % 1000
+
+def _tc_minor(class_id):
+    # tc parses classid minors as hex ("classid 1:30" is minor 0x30), so format the decimal
+    # id the way the shell backend would pass it and read it back as hex.
+    return int('{}'.format(class_id), 16)
+
+
+class TrafficControlNetlink(object):
+    """Rate limiter backend that configures the kernel's traffic control directly over netlink
+    (via pyroute2), instead of forking the ``tc`` binary for every command. It installs the same
+    HTB qdisc/class/filter layout as the shell backend, so both can coexist on one interface.
+    """
+
+    def __init__(self, remote_ip, port, rate_bytes_per_sec, ipr=None):
+        """TrafficControlNetlink constructor.
+
+        Args:
+            remote_ip (str): Device IP address.
+            port (int): Device dport to limit.
+            rate_bytes_per_sec (int): Rate limit in bytes per second.
+            ipr (:class:`pyroute2.IPRoute`, optional): Open netlink socket to reuse. If not given,
+                a new socket is opened and owned by this instance.
+        """
+        self._ip = remote_ip
+        self._port = port
+        self._rate_bytes_per_sec = int(rate_bytes_per_sec)
+        self._board_handle = TC_ROOT_HANDLE + _tc_minor(_ip_to_board_id(remote_ip))
+        self._port_handle = TC_ROOT_HANDLE + _tc_minor(_port_to_port_id(port))
+        self._ipr = ipr if ipr is not None else _open_netlink_socket()
+        if self._ipr is None:
+            raise BadTCCallError("pyroute2 is required for the netlink rate limiter backend")
+        self._ifindex = None
+
+    def set_rate_limit(self):
+        self.add_shared_classes()
+        self.set_port_limit()
+
+    def reset_rate_limit(self):
+        self.reset_port_limit()
+        self.del_board_class()
+
+    def add_shared_classes(self):
+        """Adds the qdisc and the per-board class, which are shared between all ports of a board.
+        Callers that configure several ports must call this once, before any concurrent
+        :meth:`set_port_limit` calls.
+        """
+        ifindex = self._get_ifindex()
+        # The qdisc and the per-board class may be left over from a previous run; that is fine.
+        self._tc('add', 'htb', ifindex, TC_ROOT_HANDLE, default=0x10, direct_qlen=2000,
+                 ignore_exists=True)
+        self._tc('add-class', 'htb', ifindex, self._board_handle, parent=TC_ROOT_HANDLE,
+                 rate='1gbit', ignore_exists=True)
+
+    def set_port_limit(self):
+        """Adds the class and filter for this port only; independent of any other port."""
+        ifindex = self._get_ifindex()
+        self._tc('add-class', 'htb', ifindex, self._port_handle, parent=self._board_handle,
+                 rate=self._rate_bytes_per_sec, ceil=self._rate_bytes_per_sec,
+                 burst=1024)  # "maxburst 1kb" in the shell backend
+        dst_ip = struct.unpack('!I', socket.inet_aton(self._ip))[0]
+        self._tc('add-filter', 'u32', ifindex, parent=TC_ROOT_HANDLE, prio=1, protocol=ETH_P_IP,
+                 target=self._port_handle,
+                 keys=['0x{:08x}/0xffffffff+16'.format(dst_ip), '0x{:08x}/0x0000ffff+20'.format(self._port)])
+
+    def reset_port_limit(self):
+        # Best effort, as in the shell backend: the rules may not exist
+        ifindex = self._get_ifindex()
+        self._del_input_filters(ifindex)
+        self._tc('del-class', 'htb', ifindex, self._port_handle, parent=self._board_handle,
+                 ignore_fails=True)
+
+    def del_board_class(self):
+        # Best effort: the class may still be busy serving other ports
+        self._tc('del-class', 'htb', self._get_ifindex(), self._board_handle, parent=TC_ROOT_HANDLE,
+                 ignore_fails=True)
+
+    def _get_ifindex(self):
+        if self._ifindex is None:
+            interface_name = NetworkRateLimiter.get_interface_name(self._ip)
+            links = self._ipr.link_lookup(ifname=interface_name)
+            if not links:
+                raise BadTCCallError("Interface {} was not found".format(interface_name))
+            self._ifindex = links[0]
+        return self._ifindex
+
+    def _del_input_filters(self, ifindex):
+        # u32 filters can only be deleted by handle, so find the ones targeting our port class.
+        # The kernel deletes by handle, but pyroute2's u32 parameter processor still requires
+        # the target/keys kwargs, so pass them (with no keys) to keep it happy.
+        for tc_filter in self._ipr.get_filters(index=ifindex, parent=TC_ROOT_HANDLE):
+            if tc_filter.get_attr('TCA_KIND') != 'u32':
+                continue
+            options = tc_filter.get_attr('TCA_OPTIONS')
+            if (options is None) or (options.get_attr('TCA_U32_CLASSID') != self._port_handle):
+                continue
+            self._tc('del-filter', 'u32', ifindex, tc_filter['handle'], parent=TC_ROOT_HANDLE,
+                     prio=1, protocol=ETH_P_IP, target=self._port_handle, keys=[], ignore_fails=True)
+
+    def _tc(self, command, kind, ifindex, handle=None, ignore_exists=False, ignore_fails=False, **kwargs):
+        from pyroute2.netlink.exceptions import NetlinkError
+        try:
+            self._ipr.tc(command, kind, ifindex, handle, **kwargs)
+        except NetlinkError as e:
+            if ignore_fails or (ignore_exists and (e.code == errno.EEXIST)):
+                return
+            raise BadTCCallError("tc {} {} failed: {}".format(command, kind, e)) from e
+        except Exception as e:
+            # pyroute2's tc plugins change their expected kwargs between versions; degrade an
+            # API mismatch the same way as a failed command instead of escaping mid-teardown
+            if ignore_fails:
+                return
+            raise BadTCCallError("tc {} {} failed: {}".format(command, kind, e)) from e
+
+
+def _emit_tc_commands(op, interface_name, remote_ip, port, rate_bytes_per_sec=None):
+    """Returns the tc command lines (without the leading ``tc``, as ``tc -batch`` expects) that
+    set or reset the rate limit for a single port. Mirrors the shell backend's HTB layout.
+
+    Args:
+        op (str): Either 'set' or 'reset'. The rate is only needed for 'set'.
+    """
+    board_id = _ip_to_board_id(remote_ip)
+    port_id = _port_to_port_id(port)
+    if op == 'set':
+        return [
+            'class add dev {} parent 1:{} classid 1:{} htb rate {}bps ceil {}bps maxburst 1kb'.format(
+                interface_name, board_id, port_id, int(rate_bytes_per_sec), int(rate_bytes_per_sec)),
+            'filter add dev {} protocol ip parent 1:0 prio 1 u32 match ip dst {} match ip dport {} 0xffff flowid 1:{}'.format(
+                interface_name, remote_ip, port, port_id),
+        ]
+    return [
+        'filter del dev {} protocol ip parent 1:0 prio 1 u32 match ip dst {} match ip dport {} 0xffff flowid 1:{}'.format(
+            interface_name, remote_ip, port, port_id),
+        'class del dev {} parent 1:{} classid 1:{}'.format(interface_name, board_id, port_id),
+        'class del dev {} parent 1: classid 1:{}'.format(interface_name, board_id),
+    ]
+
+def _run_tc_batch(commands, force=False):
+    """Feeds all command lines to a single ``tc -batch -`` process. With ``force=True`` tc keeps
+    going past failing commands (for best-effort resets and rules that may already exist).
+    """
+    if not commands:
+        return
+    argv = ['tc', '-force', '-batch', '-'] if force else ['tc', '-batch', '-']
+    if hasattr(os, 'geteuid') and (os.geteuid() != 0):
+        argv = ['sudo'] + argv
+    result = subprocess.run(argv, input='\n'.join(commands) + '\n', text=True, capture_output=True)
+    if (not force) and (result.returncode != 0):
+        raise BadTCParamError("tc -batch failed: {}".format(result.stderr.strip()))
+
+
+def _create_rate_limiter(remote_ip, port, rate_bytes_per_sec, ipr=None):
+    """Returns the netlink backend when a netlink socket is available, otherwise falls back to
+    the :class:`~hailo_platform.pyhailort.pyhailort.NetworkRateLimiter` shell backend.
+    """
+    if ipr is not None:
+        return TrafficControlNetlink(remote_ip, port, rate_bytes_per_sec, ipr=ipr)
+    return NetworkRateLimiter(remote_ip, port, rate_bytes_per_sec)
+
+
 class RateLimiterWrapper(object):
     """UDPRateLimiter wrapper enabling ``with`` statements."""
     def __init__(self, configured_network_group, fps=1, fps_factor=1.0, remote_ip=None):
@@ -47,22 +250,119 @@ class RateLimiterWrapper(object):
         self._fps_factor = fps_factor
         self._rates_dict = {}
         self._tc_dict = {}
+        self._applied_rates = {}
+        self._ipr = None
 
     def __enter__(self):
         max_supported_kbps_rate = DEFAULT_MAX_KBPS
 
         self._rates_dict = self._network_group.get_udp_rates_dict((self._fps * self._fps_factor),
             (max_supported_kbps_rate * BYTES_IN_Kbits))
-        for port, rate in self._rates_dict.items():
-            self._tc_dict[port] = NetworkRateLimiter(self._remote_ip, port, rate)
-            self._tc_dict[port].reset_rate_limit()
-            self._tc_dict[port].set_rate_limit()
+        # A single netlink socket (when pyroute2 is available) serves all ports and is kept open
+        # across repeated entries until __exit__ closes it, so N ports cost one socket and N
+        # messages instead of 2N tc processes.
+        if self._ipr is None:
+            self._ipr = _open_netlink_socket()
+        # Only touch ports whose rate actually changed since the last entry, so re-entering the
+        # wrapper for an already-configured network group is nearly free.
+        changed_rates = {port: rate for port, rate in self._rates_dict.items()
+                         if self._applied_rates.get(port) != rate}
+        stale_ports = set(self._applied_rates) - set(self._rates_dict)
+        for port, rate in changed_rates.items():
+            self._tc_dict[port] = _create_rate_limiter(self._remote_ip, port, rate, ipr=self._ipr)
+        if self._ipr is not None:
+            # The qdisc and the per-board class are shared between all ports, so they are added
+            # once, serially; only the independent per-port class/filter calls (each an I/O-bound
+            # round trip) run concurrently, paying for the slowest port instead of the sum.
+            if changed_rates:
+                self._tc_dict[next(iter(changed_rates))].add_shared_classes()
+            self._run_on_ports(stale_ports, lambda tc: tc.reset_port_limit())
+            self._run_on_ports(changed_rates, lambda tc: (tc.reset_port_limit(), tc.set_port_limit()))
+        else:
+            self._apply_shell_batch(changed_rates, stale_ports)
+        for port in stale_ports:
+            del self._tc_dict[port]
+        self._applied_rates = dict(self._rates_dict)
 
     def __exit__(self, *args, **kwargs):
-        for tc in self._tc_dict.values():
-            tc.reset_rate_limit()
+        try:
+            if self._ipr is not None:
+                self._run_on_ports(self._applied_rates, lambda tc: tc.reset_port_limit())
+                # The shared board class is deleted once, after all port classes under it are gone
+                if self._tc_dict:
+                    next(iter(self._tc_dict.values())).del_board_class()
+            else:
+                self._reset_shell_batch(self._applied_rates)
+        finally:
+            self._applied_rates = {}
+            self._tc_dict = {}
+            if self._ipr is not None:
+                self._ipr.close()
+                self._ipr = None
         return False
 
+    def _apply_shell_batch(self, changed_rates, stale_ports):
+        """Configures the changed ports with two tc processes instead of a fork/exec per command.
+        Falls back to the per-port backend if ``tc -batch`` rejects the input.
+        """
+        if not (changed_rates or stale_ports):
+            # Nothing changed since the last entry; don't spawn tc at all
+            return
+        interface_name = NetworkRateLimiter.get_interface_name(self._remote_ip)
+        # Old rules may not exist and the qdisc/board class may already exist, so these lines run
+        # under -force; the per-port class and filter adds must succeed, so they run strict.
+        tolerant = []
+        strict = []
+        for port in stale_ports:
+            tolerant.extend(_emit_tc_commands('reset', interface_name, self._remote_ip, port))
+        for port, rate in changed_rates.items():
+            tolerant.extend(_emit_tc_commands('reset', interface_name, self._remote_ip, port))
+            strict.extend(_emit_tc_commands('set', interface_name, self._remote_ip, port, rate))
+        tolerant.append('qdisc add dev {} root handle 1: htb default 10 direct_qlen 2000'.format(interface_name))
+        tolerant.append('class add dev {} parent 1: classid 1:{} htb rate 1Gbit'.format(
+            interface_name, _ip_to_board_id(self._remote_ip)))
+        try:
+            _run_tc_batch(tolerant, force=True)
+            _run_tc_batch(strict)
+        except (BadTCParamError, OSError):
+            # The shell backend's reset/set also delete and re-add the shared per-board class,
+            # so the per-port fallback must stay serial.
+            self._run_on_ports(stale_ports, lambda tc: tc.reset_rate_limit(), parallel=False)
+            self._run_on_ports(changed_rates, lambda tc: (tc.reset_rate_limit(), tc.set_rate_limit()),
+                parallel=False)
+
+    def _reset_shell_batch(self, ports):
+        if not ports:
+            return
+        interface_name = NetworkRateLimiter.get_interface_name(self._remote_ip)
+        commands = []
+        for port in ports:
+            commands.extend(_emit_tc_commands('reset', interface_name, self._remote_ip, port))
+        try:
+            _run_tc_batch(commands, force=True)
+        except OSError:
+            # Serial for the same reason as in _apply_shell_batch
+            self._run_on_ports(ports, lambda tc: tc.reset_rate_limit(), parallel=False)
+
+    def _run_on_ports(self, ports, func, parallel=True):
+        tcs = [self._tc_dict[port] for port in ports if port in self._tc_dict]
+        if not tcs:
+            return
+        errors = []
+        def _run_single(tc):
+            try:
+                func(tc)
+            except Exception as e:
+                errors.append(e)
+        if parallel:
+            with ThreadPoolExecutor(max_workers=len(tcs)) as executor:
+                list(executor.map(_run_single, tcs))
+        else:
+            for tc in tcs:
+                _run_single(tc)
+        if errors:
+            raise RateLimiterException("Rate limit operation failed on {} ports: {}".format(len(errors), errors))
+
 
 class UDPRateLimiter(object):
     """Enables limiting or removing limits on UDP communication rate to a board."""
@@ -91,8 +391,13 @@ class UDPRateLimiter(object):
         Returns:
             dict: Maps between each input default dport to its calculated Rate in Kbits/sec.
         """
-        hef_object = HEF(hef)
-        input_stream_infos = hef_object.get_input_stream_infos(network_group_name)
+        # Parsing an HEF is a nontrivial read from disk; CLI flows that iterate over network
+        # groups hit the same file repeatedly, so reuse the parsed object when it is unchanged.
+        hef_path = os.path.abspath(hef)
+        hef_stat = os.stat(hef_path)
+        hef_object = _load_hef(hef_path, hef_stat.st_mtime_ns, hef_stat.st_size)
+        input_stream_infos = _get_input_stream_infos(hef_path, hef_stat.st_mtime_ns, hef_stat.st_size,
+            network_group_name)
 
         input_rates = hef_object.get_udp_rates_dict(int(fps * fps_factor), (max_supported_kbps_rate * BYTES_IN_Kbits),
             network_group_name)
@@ -49,6 +49,10 @@ if __name__ == "__main__":
                 "hailo=hailo_platform.tools.hailocli.main:main",
             ]
         },
+        extras_require={
+            # Optional netlink backend for the UDP rate limiter (see TrafficControlNetlink)
+            "netlink": ["pyroute2>=0.6.9,<0.10"],
+        },
         install_requires=[
             "argcomplete",
             "contextlib2",